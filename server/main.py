@@ -3,20 +3,30 @@ Chess.com Anti-Cheat Global Database Server
 A simple FastAPI server for crowdsourcing cheater detection data
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Tuple, Literal, get_args
+from datetime import datetime, timezone
 import os
+import gzip
+import mmap
 import json
+import orjson
 from pathlib import Path
+from collections import deque
+import asyncio
 import hashlib
+import time
+from sortedcontainers import SortedKeyList
+import numpy as np
 
 app = FastAPI(
     title="Chess Anti-Cheat Global Database",
     description="Crowdsourced database of suspicious chess.com players",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware to allow Chrome extension requests
@@ -32,15 +42,74 @@ app.add_middleware(
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
-REPORTS_FILE = DATA_DIR / "reports.json"
+REPORTS_FILE = DATA_DIR / "reports.json.gz"
+LEGACY_REPORTS_FILE = DATA_DIR / "reports.json"  # uncompressed snapshot of older versions
+REPORTS_LOG = DATA_DIR / "reports.jsonl"
 STATS_FILE = DATA_DIR / "statistics.json"
 
+GameFormat = Literal["bullet", "blitz", "rapid"]
+ConfidenceLevel = Literal["low", "medium", "high", "confirmed"]
+
+# Per-player report counts are stored as a list indexed by game format
+GAME_FORMATS = get_args(GameFormat)
+FORMAT_IDX = {game_format: idx for idx, game_format in enumerate(GAME_FORMATS)}
+
+# Confidence levels as (min reports, min average risk, level), highest first;
+# players matching none of them are "low"
+CONFIDENCE_TIERS = (
+    (10, 80, "confirmed"),
+    (5, 70, "high"),
+    (3, 60, "medium"),
+)
+
+# Snapshot the reports every SNAPSHOT_INTERVAL seconds (if anything was written since)
+SNAPSHOT_INTERVAL = 60
+
 # Initialize data files if they don't exist
-if not REPORTS_FILE.exists():
-    REPORTS_FILE.write_text(json.dumps({"reports": [], "reputation": {}}))
+if not REPORTS_FILE.exists() and not LEGACY_REPORTS_FILE.exists():
+    REPORTS_FILE.write_bytes(gzip.compress(orjson.dumps({"reports": [], "reputation": {}})))
 
 if not STATS_FILE.exists():
-    STATS_FILE.write_text(json.dumps({"total_reports": 0, "total_users": 0, "last_updated": None}))
+    STATS_FILE.write_bytes(orjson.dumps({"total_reports": 0, "total_users": 0, "last_updated": None}))
+
+
+# In-memory state (authoritative), loaded at startup from the snapshot + append log.
+# "seq" is the sequence number of the last log entry (report or ban) included in the state.
+# State is only mutated synchronously on the event loop, so no global lock is needed.
+STATE: Dict[str, Any] = {"reports": [], "reputation": {}, "seq": 0}
+writes_since_snapshot = 0
+
+# Log lines and snapshots waiting for the background writer, in submission order.
+# Each entry is (kind, content, future) where kind is "log" or "snapshot".
+WRITE_QUEUE: List[Tuple[str, bytes, asyncio.Future]] = []
+# "snapshots" is the periodic snapshot task, stopped before the writer on shutdown.
+WRITER: Dict[str, Any] = {"wakeup": None, "task": None, "snapshots": None}
+
+# Stale-while-revalidate cache for global statistics: fresh values are returned as is,
+# stale ones are returned while a refresh runs in the background
+STATS_FRESH_TTL = 30
+STATS_STALE_TTL = 300
+STATS_CACHE: Dict[str, Any] = {"value": None, "version": 0, "fresh_until": 0, "stale_until": 0, "refresh_task": None}
+
+# Bumped on every write; statistics and player lookups use it as a weak ETag
+write_version = 0
+
+# Rolling report counters: one bucket per hour for the last 24h and one per day for the last 7d.
+# BUCKET_CLOCK holds the hour/day number (since the epoch) of the newest bucket.
+HOUR_BUCKETS = deque([0] * 24, maxlen=24)
+DAY_BUCKETS = deque([0] * 7, maxlen=7)
+BUCKET_CLOCK = {"hour": 0, "day": 0}
+
+# Reputation entries ordered by total reports (descending), used for the top reported
+# players and kept up to date on every submit. Ties keep insertion order (the player's
+# search row), so statistics and search list tied players the same way.
+REPUTATION_VIEW = SortedKeyList(key=lambda rep: (-rep["total_reports"], SEARCH_ARRAYS["rows"][rep["username_lc"]]))
+
+# Struct-of-arrays copy of the fields search filters on, one row per player in insertion
+# order, so that search is a vectorized mask instead of a Python loop over every player.
+# "rows" maps username_lc to its row, "reps" holds the reputation entry of each row.
+CONFIDENCE_LEVELS = get_args(ConfidenceLevel)
+SEARCH_ARRAYS: Dict[str, Any] = {}
 
 
 # Models
@@ -48,12 +117,26 @@ class PlayerReport(BaseModel):
     """Report of a suspicious player"""
     username: str = Field(..., min_length=2, max_length=25)
     risk_score: float = Field(..., ge=0, le=100)
-    game_format: str = Field(..., pattern="^(bullet|blitz|rapid)$")
+    game_format: GameFormat
     timestamp: Optional[datetime] = None
     reporter_hash: Optional[str] = None  # Anonymous hash of reporter
     factors: Optional[Dict[str, Any]] = None
     notes: Optional[str] = Field(None, max_length=500)
 
+    @field_validator("timestamp")
+    @classmethod
+    def check_timestamp_range(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Only accept timestamps between the UNIX epoch and one day from now"""
+        if value is None:
+            return value
+        try:
+            ts = value.timestamp()
+        except (ValueError, OverflowError, OSError):
+            raise ValueError("timestamp is out of range")
+        if not 0 <= ts <= time.time() + 86400:
+            raise ValueError("timestamp is out of range")
+        return value
+
 
 class PlayerReputation(BaseModel):
     """Aggregated reputation data for a player"""
@@ -86,33 +169,334 @@ class HealthCheck(BaseModel):
 
 
 # Helper functions
+def encode_json(data: Any) -> bytes:
+    """Serialize with orjson, falling back to the stdlib for values it rejects (e.g. big integers)"""
+    try:
+        return orjson.dumps(data)
+    except orjson.JSONEncodeError:
+        return json.dumps(data).encode()
+
+
+def decode_json(content: bytes) -> Any:
+    """Parse with orjson, falling back to the stdlib for values it rejects (NaN, big integers)"""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
 def load_reports() -> dict:
-    """Load reports from file"""
+    """Load reports from file; raises if an existing snapshot cannot be read"""
+    if REPORTS_FILE.exists():
+        with gzip.open(REPORTS_FILE, "rb") as f:
+            return decode_json(f.read())
+    if LEGACY_REPORTS_FILE.exists():
+        # Written by older versions with the stdlib json module
+        return json.loads(LEGACY_REPORTS_FILE.read_bytes())
+    return {"reports": [], "reputation": {}}
+
+
+def fsync_directory(path: Path):
+    """Flush directory entries (renames) to disk; not supported on Windows"""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
     try:
-        return json.loads(REPORTS_FILE.read_text())
-    except Exception as e:
-        print(f"Error loading reports: {e}")
-        return {"reports": [], "reputation": {}}
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save_reports(content: bytes):
+    """Save serialized reports to file (compressed, atomically via a temp file) and truncate the log"""
+    tmp_file = REPORTS_FILE.with_name(REPORTS_FILE.name + ".tmp")
+    with tmp_file.open("wb") as f:
+        f.write(gzip.compress(content, compresslevel=6))
+        f.flush()
+        # The log is only truncated once the snapshot is durable on disk
+        os.fsync(f.fileno())
+    os.replace(tmp_file, REPORTS_FILE)
+    # Make the rename itself durable before the log it replaces is truncated
+    fsync_directory(DATA_DIR)
+    REPORTS_LOG.write_bytes(b"")
+    LEGACY_REPORTS_FILE.unlink(missing_ok=True)
+
+
+def write_log_lines(lines: List[bytes]):
+    """Append a batch of serialized reports to the log with a single write"""
+    with REPORTS_LOG.open("ab") as f:
+        f.write(b"".join(lines))
+
+
+def roll_buckets(now: float):
+    """Advance the rolling report counters to the current hour and day"""
+    for buckets, key, period in ((HOUR_BUCKETS, "hour", 3600), (DAY_BUCKETS, "day", 86400)):
+        current = int(now // period)
+        elapsed = current - BUCKET_CLOCK[key]
+        if elapsed > 0:
+            buckets.extend([0] * min(elapsed, buckets.maxlen))
+            BUCKET_CLOCK[key] = current
+
+
+def count_recent_report(ts: int):
+    """Add a report to the rolling 24h/7d counters"""
+    roll_buckets(time.time())
+    for buckets, key, period in ((HOUR_BUCKETS, "hour", 3600), (DAY_BUCKETS, "day", 86400)):
+        # Reports dated in the future are counted in the newest bucket
+        age = max(BUCKET_CLOCK[key] - ts // period, 0)
+        if age < len(buckets):
+            buckets[-1 - age] += 1
+
+
+def rebuild_buckets(reports: list):
+    """Recompute the rolling report counters from scratch"""
+    HOUR_BUCKETS.extend([0] * HOUR_BUCKETS.maxlen)
+    DAY_BUCKETS.extend([0] * DAY_BUCKETS.maxlen)
+    roll_buckets(time.time())
+    for report in reports:
+        count_recent_report(report["ts"])
+
+
+def apply_report(report_dict: dict) -> dict:
+    """Apply a report to the in-memory state and return the updated reputation"""
+    STATE["reports"].append(report_dict)
+    STATE["seq"] = max(STATE["seq"], report_dict.get("seq", 0))
+    count_recent_report(report_dict["ts"])
+
+    # Update reputation
+    username_lc = report_dict["username"].lower()
+    rep = STATE["reputation"].get(username_lc)
+    if rep is None:
+        rep = STATE["reputation"][username_lc] = {
+            "username": report_dict["username"],
+            "username_lc": username_lc,
+            "total_reports": 0,
+            "risk_score_sum": 0.0,
+            "formats": [0] * len(GAME_FORMATS),
+            "first_reported": report_dict["ts"],
+            "last_reported": report_dict["ts"],
+            "is_banned": False
+        }
+    else:
+        # Remove before the key (total_reports) changes
+        REPUTATION_VIEW.discard(rep)
+
+    rep["total_reports"] += 1
+    rep["risk_score_sum"] += report_dict["risk_score"]
+    rep["last_reported"] = report_dict["ts"]
+
+    # Track format
+    rep["formats"][FORMAT_IDX[report_dict["game_format"]]] += 1
+
+    # Calculate average risk score
+    average_risk_score = rep["risk_score_sum"] / rep["total_reports"]
+    rep["confidence_level"] = calculate_confidence_level(
+        rep["total_reports"],
+        average_risk_score
+    )
+    # Stored rounded, as returned by the API
+    rep["average_risk_score"] = round(average_risk_score, 2)
+    # The search row is assigned first, the view orders ties by it
+    update_search_arrays(rep)
+    REPUTATION_VIEW.add(rep)
+
+    return rep
+
+
+def apply_ban(ban_dict: dict):
+    """Apply a ban record to the in-memory state"""
+    STATE["seq"] = max(STATE["seq"], ban_dict["seq"])
+    rep = STATE["reputation"].get(ban_dict["username"])
+    if rep is None:
+        return
+
+    rep["is_banned"] = ban_dict["banned"]
+    if ban_dict["banned"]:
+        rep["confidence_level"] = "confirmed"
+    update_search_arrays(rep)
+
+
+def reset_search_arrays(capacity: int = 1024):
+    """Drop all rows from the search arrays"""
+    SEARCH_ARRAYS.update(
+        size=0,
+        rows={},
+        reps=[],
+        total=np.zeros(capacity, dtype=np.int64),
+        risk_sum=np.zeros(capacity, dtype=np.float64),
+        confidence=np.zeros(capacity, dtype=np.int8)
+    )
+
+
+def update_search_arrays(rep: dict):
+    """Copy a reputation entry into its row of the search arrays"""
+    arrays = SEARCH_ARRAYS
+    row = arrays["rows"].get(rep["username_lc"])
+    if row is None:
+        row = arrays["size"]
+        if row == len(arrays["total"]):
+            # Grow by doubling so appends stay amortized O(1)
+            for name in ("total", "risk_sum", "confidence"):
+                arrays[name] = np.resize(arrays[name], 2 * row)
+        arrays["size"] = row + 1
+        arrays["rows"][rep["username_lc"]] = row
+        arrays["reps"].append(rep)
+
+    arrays["total"][row] = rep["total_reports"]
+    arrays["risk_sum"][row] = rep["risk_score_sum"]
+    arrays["confidence"][row] = CONFIDENCE_LEVELS.index(rep["confidence_level"])
+
+
+def parse_timestamp(value: Any) -> int:
+    """Convert an ISO timestamp written by older server versions to UNIX seconds"""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return 0
+
+
+def format_timestamp(ts: int) -> Optional[str]:
+    """Format UNIX seconds as a UTC ISO timestamp for API responses (None if not representable)"""
+    try:
+        return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def migrate_report(report_dict: dict) -> dict:
+    """Upgrade a report written by older server versions"""
+    if "ts" not in report_dict:
+        report_dict["ts"] = parse_timestamp(report_dict.pop("timestamp", None))
+    return report_dict
+
+
+def migrate_reputation(reputation: dict):
+    """Upgrade reputation entries written by older server versions"""
+    for username_lc, rep in reputation.items():
+        rep.setdefault("username_lc", username_lc)
+        if "risk_score_sum" not in rep:
+            rep["risk_score_sum"] = float(sum(rep.pop("risk_scores", [])))
+        rep["average_risk_score"] = round(rep["risk_score_sum"] / rep["total_reports"], 2)
+        rep.setdefault("is_banned", False)
+        if isinstance(rep["formats"], dict):
+            rep["formats"] = [rep["formats"].get(game_format, 0) for game_format in GAME_FORMATS]
+        rep["first_reported"] = parse_timestamp(rep["first_reported"])
+        rep["last_reported"] = parse_timestamp(rep["last_reported"])
+
+
+def queue_write(kind: str, content: bytes) -> asyncio.Future:
+    """Queue a log line or snapshot for the background writer"""
+    future = asyncio.get_running_loop().create_future()
+    WRITE_QUEUE.append((kind, content, future))
+    WRITER["wakeup"].set()
+    return future
+
+
+def encode_report(report_dict: dict) -> bytes:
+    """Serialize a report or ban record as one log line"""
+    return orjson.dumps(report_dict) + b"\n"
+
+
+def append_report_log(line: bytes) -> asyncio.Future:
+    """Queue a single serialized report or ban record for appending to the reports log"""
+    return queue_write("log", line)
+
+
+async def storage_writer():
+    """Write queued log lines and snapshots off the event loop, one batch per wakeup"""
+    wakeup = WRITER["wakeup"]
+    while True:
+        await wakeup.wait()
+        wakeup.clear()
+
+        jobs = WRITE_QUEUE[:]
+        del WRITE_QUEUE[:]
+
+        # Consecutive log lines are grouped into one write; snapshots keep their position
+        # in the queue so that truncating the log never drops lines queued after them
+        pending: List[asyncio.Future] = []
+        lines: List[bytes] = []
+        for kind, content, future in jobs:
+            if kind == "log":
+                lines.append(content)
+                pending.append(future)
+                continue
+            if lines:
+                await run_write(write_log_lines, lines, pending)
+                lines, pending = [], []
+            await run_write(save_reports, content, [future])
+        if lines:
+            await run_write(write_log_lines, lines, pending)
 
 
-def save_reports(data: dict):
-    """Save reports to file"""
+async def run_write(func, content, futures: List[asyncio.Future]):
+    """Run a blocking write in a worker thread and resolve the waiting futures"""
     try:
-        REPORTS_FILE.write_text(json.dumps(data, indent=2, default=str))
+        await asyncio.to_thread(func, content)
     except Exception as e:
         print(f"Error saving reports: {e}")
+        for future in futures:
+            if not future.done():
+                future.set_exception(e)
+    else:
+        for future in futures:
+            if not future.done():
+                future.set_result(None)
+
+
+def replay_reports_log():
+    """Apply reports and bans from the log that are newer than the loaded snapshot"""
+    if not REPORTS_LOG.exists() or REPORTS_LOG.stat().st_size == 0:
+        return
+
+    # Read the log through a memory map instead of copying it into a buffer first
+    with REPORTS_LOG.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log:
+        for line_number, line in enumerate(iter(log.readline, b""), 1):
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except ValueError:
+                # A crash during an append can leave a partially written last line
+                print(f"Skipping unreadable line {line_number} in {REPORTS_LOG.name}")
+                continue
+            # Entries up to STATE["seq"] are already in the snapshot
+            if entry.get("seq", 0) <= STATE["seq"]:
+                continue
+            if entry.get("kind") == "ban":
+                apply_ban(entry)
+            else:
+                apply_report(migrate_report(entry))
+
+
+def snapshot_state() -> asyncio.Future:
+    """Queue a snapshot of the in-memory state; the log is truncated once it is written"""
+    global writes_since_snapshot
+
+    writes_since_snapshot = 0
+    return queue_write("snapshot", encode_json(STATE))
+
+
+async def snapshot_loop():
+    """Periodically snapshot the in-memory state"""
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        if writes_since_snapshot:
+            try:
+                await snapshot_state()
+            except Exception as e:
+                # Already logged by the writer; retry on the next interval
+                print(f"Periodic snapshot failed: {e}")
 
 
 def calculate_confidence_level(report_count: int, avg_risk: float) -> str:
     """Calculate confidence level based on reports"""
-    if report_count >= 10 and avg_risk >= 80:
-        return "confirmed"
-    elif report_count >= 5 and avg_risk >= 70:
-        return "high"
-    elif report_count >= 3 and avg_risk >= 60:
-        return "medium"
-    else:
-        return "low"
+    for min_reports, min_risk, level in CONFIDENCE_TIERS:
+        if report_count >= min_reports and avg_risk >= min_risk:
+            return level
+    return "low"
 
 
 def hash_reporter_id(reporter_id: str) -> str:
@@ -120,6 +504,86 @@ def hash_reporter_id(reporter_id: str) -> str:
     return hashlib.sha256(reporter_id.encode()).hexdigest()[:16]
 
 
+def compute_global_statistics() -> GlobalStats:
+    """Compute global statistics from the in-memory state"""
+    reports = STATE["reports"]
+    reputation = STATE["reputation"]
+
+    # Count recent reports
+    roll_buckets(time.time())
+    reports_24h = sum(HOUR_BUCKETS)
+    reports_7d = sum(DAY_BUCKETS)
+
+    # Count confirmed cheaters
+    confirmed_count = sum(1 for rep in reputation.values()
+                        if rep["confidence_level"] == "confirmed" or rep["is_banned"])
+
+    # Get top reported players
+    top_players = [
+        {
+            "username": rep["username"],
+            "total_reports": rep["total_reports"],
+            "average_risk_score": rep["average_risk_score"],
+            "confidence_level": rep["confidence_level"]
+        }
+        for rep in REPUTATION_VIEW[:10]
+    ]
+
+    return GlobalStats(
+        total_reports=len(reports),
+        total_unique_players=len(reputation),
+        total_confirmed_cheaters=confirmed_count,
+        reports_last_24h=reports_24h,
+        reports_last_7d=reports_7d,
+        top_reported_players=top_players
+    )
+
+
+def refresh_stats_cache() -> GlobalStats:
+    """Recompute global statistics and store them in the cache"""
+    value = compute_global_statistics()
+    now = time.monotonic()
+    STATS_CACHE["value"] = value
+    STATS_CACHE["version"] = write_version
+    STATS_CACHE["fresh_until"] = now + STATS_FRESH_TTL
+    STATS_CACHE["stale_until"] = now + STATS_STALE_TTL
+    return value
+
+
+async def revalidate_stats_cache():
+    """Background refresh of stale global statistics"""
+    try:
+        refresh_stats_cache()
+    except Exception as e:
+        print(f"Error refreshing statistics: {e}")
+
+
+def invalidate_stats_cache():
+    """Mark cached statistics as stale after a write"""
+    STATS_CACHE["fresh_until"] = 0
+
+
+def bump_write_version():
+    """Change the ETag of every GET endpoint after a write"""
+    global write_version
+    write_version += 1
+
+
+def make_etag(version: int) -> str:
+    """Build a weak ETag for a state version (unique per server run)"""
+    return f'W/"{int(start_time.timestamp())}-{version}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already has the current version"""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    # A list of tags or "*"; If-None-Match uses weak comparison, so W/ is ignored
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+
+
 # Startup event
 start_time = datetime.now()
 
@@ -135,6 +599,39 @@ async def startup_event():
     print(f"🌐 Server started at: {start_time}")
     print("=" * 50)
 
+    try:
+        data = load_reports()
+    except Exception as e:
+        # Refuse to start rather than overwrite the snapshot with an empty state
+        print(f"❌ Error loading reports: {e}")
+        raise
+    STATE["reports"] = [migrate_report(report_dict) for report_dict in data.get("reports", [])]
+    STATE["reputation"] = data.get("reputation", {})
+    STATE["seq"] = data.get("seq", 0)
+    migrate_reputation(STATE["reputation"])
+    reset_search_arrays()
+    for rep in STATE["reputation"].values():
+        update_search_arrays(rep)
+    REPUTATION_VIEW.clear()
+    REPUTATION_VIEW.update(STATE["reputation"].values())
+    rebuild_buckets(STATE["reports"])
+    replay_reports_log()
+
+    WRITER["wakeup"] = asyncio.Event()
+    WRITER["task"] = asyncio.create_task(storage_writer())
+    await snapshot_state()
+
+    WRITER["snapshots"] = asyncio.create_task(snapshot_loop())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Persist in-memory state on shutdown"""
+    # Stop periodic snapshots first, so none is queued once the writer is gone
+    WRITER["snapshots"].cancel()
+    await snapshot_state()
+    WRITER["task"].cancel()
+
 
 # API Endpoints
 @app.get("/", tags=["General"])
@@ -151,67 +648,43 @@ async def root():
 @app.get("/health", response_model=HealthCheck, tags=["General"])
 async def health_check():
     """Health check endpoint for extension to verify server availability"""
-    data = load_reports()
+    reports = STATE["reports"]
     uptime = datetime.now() - start_time
 
     return HealthCheck(
         status="healthy",
         version="2.0.0",
         uptime=str(uptime).split('.')[0],  # Remove microseconds
-        total_reports=len(data.get("reports", [])),
-        last_updated=data.get("reports", [{}])[-1].get("timestamp") if data.get("reports") else None
+        total_reports=len(reports),
+        last_updated=format_timestamp(reports[-1]["ts"]) if reports else None
     )
 
 
 @app.post("/api/reports/submit", tags=["Reports"])
 async def submit_report(report: PlayerReport):
     """Submit a new player report"""
-    try:
-        data = load_reports()
+    global writes_since_snapshot
 
-        # Add timestamp if not provided
-        if not report.timestamp:
-            report.timestamp = datetime.now()
-
-        # Convert to dict
-        report_dict = report.model_dump()
-        report_dict['timestamp'] = report.timestamp.isoformat()
-
-        # Add to reports
-        data["reports"].append(report_dict)
-
-        # Update reputation
-        username = report.username.lower()
-        if username not in data["reputation"]:
-            data["reputation"][username] = {
-                "username": report.username,
-                "total_reports": 0,
-                "risk_scores": [],
-                "formats": {},
-                "first_reported": report_dict['timestamp'],
-                "last_reported": report_dict['timestamp'],
-                "is_banned": False
-            }
-
-        rep = data["reputation"][username]
-        rep["total_reports"] += 1
-        rep["risk_scores"].append(report.risk_score)
-        rep["last_reported"] = report_dict['timestamp']
+    try:
+        # Convert to dict, storing the timestamp as UNIX seconds (now if not provided)
+        report_dict = report.model_dump(exclude={"timestamp"})
+        report_dict["ts"] = int(report.timestamp.timestamp()) if report.timestamp else int(time.time())
+        report_dict['seq'] = STATE["seq"] + 1
 
-        # Track format
-        format_key = report.game_format
-        rep["formats"][format_key] = rep["formats"].get(format_key, 0) + 1
+        # Serialize before touching the state so an unencodable report changes nothing
+        try:
+            line = encode_report(report_dict)
+        except orjson.JSONEncodeError as e:
+            raise HTTPException(status_code=422, detail=f"Report cannot be stored: {str(e)}")
 
-        # Calculate average risk score
-        rep["average_risk_score"] = sum(rep["risk_scores"]) / len(rep["risk_scores"])
-        rep["confidence_level"] = calculate_confidence_level(
-            rep["total_reports"],
-            rep["average_risk_score"]
-        )
+        rep = apply_report(report_dict)
+        written = append_report_log(line)
+        invalidate_stats_cache()
+        bump_write_version()
 
-        save_reports(data)
+        writes_since_snapshot += 1
 
-        return {
+        result = {
             "success": True,
             "message": "Report submitted successfully",
             "username": report.username,
@@ -219,36 +692,54 @@ async def submit_report(report: PlayerReport):
             "confidence_level": rep["confidence_level"]
         }
 
+        # The report is already in memory and goes into the next snapshot even if the log
+        # write fails, so the submit still succeeds (a 500 would make clients retry and
+        # count it twice).
+        try:
+            await written
+        except Exception as e:
+            print(f"Report {report_dict['seq']} kept in memory until the next snapshot: {e}")
+
+        return result
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit report: {str(e)}")
 
 
 @app.get("/api/reports/player/{username}", tags=["Reports"])
-async def get_player_reputation(username: str):
+async def get_player_reputation(username: str, request: Request, response: Response):
     """Get reputation data for a specific player"""
     try:
-        data = load_reports()
-        username_lower = username.lower()
+        etag = make_etag(write_version)
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+        rep = STATE["reputation"].get(username.lower())
 
-        if username_lower not in data["reputation"]:
+        if rep is None:
             return {
                 "found": False,
                 "username": username,
                 "message": "No reports found for this player"
             }
 
-        rep = data["reputation"][username_lower]
-
         return {
             "found": True,
             "username": rep["username"],
             "total_reports": rep["total_reports"],
-            "average_risk_score": round(rep["average_risk_score"], 2),
+            "average_risk_score": rep["average_risk_score"],
             "confidence_level": rep["confidence_level"],
-            "first_reported": rep["first_reported"],
-            "last_reported": rep["last_reported"],
-            "report_count_by_format": rep["formats"],
-            "is_banned": rep.get("is_banned", False)
+            "first_reported": format_timestamp(rep["first_reported"]),
+            "last_reported": format_timestamp(rep["last_reported"]),
+            "report_count_by_format": {
+                game_format: count
+                for game_format, count in zip(GAME_FORMATS, rep["formats"])
+                if count
+            },
+            "is_banned": rep["is_banned"]
         }
 
     except Exception as e:
@@ -259,38 +750,50 @@ async def get_player_reputation(username: str):
 async def search_suspicious_players(
     min_reports: int = Query(3, ge=1),
     min_risk_score: float = Query(60.0, ge=0, le=100),
-    confidence: Optional[str] = Query(None, pattern="^(low|medium|high|confirmed)$"),
+    confidence: Optional[ConfidenceLevel] = Query(None),
     limit: int = Query(100, ge=1, le=1000)
 ):
     """Search for suspicious players matching criteria"""
     try:
-        data = load_reports()
-        results = []
+        arrays = SEARCH_ARRAYS
+        size = arrays["size"]
+        total = arrays["total"][:size]
+        risk_sum = arrays["risk_sum"][:size]
+
+        # Filter by criteria
+        mask = (total >= min_reports) & (risk_sum / np.maximum(total, 1) >= min_risk_score)
+        if confidence:
+            mask &= arrays["confidence"][:size] == CONFIDENCE_LEVELS.index(confidence)
+        matches = np.flatnonzero(mask)
+        top = matches
+
+        if len(matches) > limit:
+            # Select the `limit` players with the most reports in O(matches) before sorting;
+            # players tied at the cut-off keep their row order, as in a stable full sort
+            totals = total[matches]
+            cutoff = np.partition(totals, len(totals) - limit)[len(totals) - limit]
+            above = matches[totals > cutoff]
+            tied = matches[totals == cutoff][:limit - len(above)]
+            top = np.concatenate((above, tied))
 
-        for username, rep in data["reputation"].items():
-            # Filter by criteria
-            if rep["total_reports"] < min_reports:
-                continue
-            if rep["average_risk_score"] < min_risk_score:
-                continue
-            if confidence and rep["confidence_level"] != confidence:
-                continue
+        # Sort by total reports (descending)
+        top = top[np.argsort(-total[top], kind="stable")]
 
+        results = []
+        for row in top:
+            rep = arrays["reps"][row]
             results.append({
                 "username": rep["username"],
                 "total_reports": rep["total_reports"],
-                "average_risk_score": round(rep["average_risk_score"], 2),
+                "average_risk_score": rep["average_risk_score"],
                 "confidence_level": rep["confidence_level"],
-                "last_reported": rep["last_reported"],
-                "is_banned": rep.get("is_banned", False)
+                "last_reported": format_timestamp(rep["last_reported"]),
+                "is_banned": rep["is_banned"]
             })
 
-        # Sort by total reports (descending)
-        results.sort(key=lambda x: x["total_reports"], reverse=True)
-
         return {
-            "total_found": len(results),
-            "players": results[:limit]
+            "total_found": len(matches),
+            "players": results
         }
 
     except Exception as e:
@@ -298,55 +801,27 @@ async def search_suspicious_players(
 
 
 @app.get("/api/statistics/global", response_model=GlobalStats, tags=["Statistics"])
-async def get_global_statistics():
+async def get_global_statistics(request: Request, response: Response):
     """Get global statistics about the database"""
     try:
-        data = load_reports()
-        reports = data.get("reports", [])
-        reputation = data.get("reputation", {})
+        now = time.monotonic()
+        stats = STATS_CACHE["value"]
 
-        now = datetime.now()
-        day_ago = now - timedelta(days=1)
-        week_ago = now - timedelta(days=7)
+        if stats is None or now >= STATS_CACHE["stale_until"]:
+            stats = refresh_stats_cache()
+        elif now >= STATS_CACHE["fresh_until"]:
+            # Serve the stale value and revalidate in the background
+            task = STATS_CACHE["refresh_task"]
+            if task is None or task.done():
+                STATS_CACHE["refresh_task"] = asyncio.create_task(revalidate_stats_cache())
 
-        # Count recent reports
-        reports_24h = 0
-        reports_7d = 0
+        # The ETag follows the served snapshot, not the latest write
+        etag = make_etag(STATS_CACHE["version"])
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
 
-        for report in reports:
-            try:
-                report_time = datetime.fromisoformat(report.get("timestamp", ""))
-                if report_time >= day_ago:
-                    reports_24h += 1
-                if report_time >= week_ago:
-                    reports_7d += 1
-            except:
-                pass
-
-        # Count confirmed cheaters
-        confirmed_count = sum(1 for rep in reputation.values()
-                            if rep.get("confidence_level") == "confirmed" or rep.get("is_banned", False))
-
-        # Get top reported players
-        top_players = []
-        for username, rep in reputation.items():
-            top_players.append({
-                "username": rep["username"],
-                "total_reports": rep["total_reports"],
-                "average_risk_score": round(rep["average_risk_score"], 2),
-                "confidence_level": rep["confidence_level"]
-            })
-
-        top_players.sort(key=lambda x: x["total_reports"], reverse=True)
-
-        return GlobalStats(
-            total_reports=len(reports),
-            total_unique_players=len(reputation),
-            total_confirmed_cheaters=confirmed_count,
-            reports_last_24h=reports_24h,
-            reports_last_7d=reports_7d,
-            top_reported_players=top_players[:10]
-        )
+        return stats
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
@@ -355,17 +830,24 @@ async def get_global_statistics():
 @app.post("/api/admin/mark-banned/{username}", tags=["Admin"])
 async def mark_player_banned(username: str, banned: bool = True):
     """Mark a player as banned (admin only - add authentication in production)"""
+    global writes_since_snapshot
+
     try:
-        data = load_reports()
-        username_lower = username.lower()
+        username_lc = username.lower()
+        rep = STATE["reputation"].get(username_lc)
 
-        if username_lower not in data["reputation"]:
+        if rep is None:
             raise HTTPException(status_code=404, detail="Player not found")
 
-        data["reputation"][username_lower]["is_banned"] = banned
-        data["reputation"][username_lower]["confidence_level"] = "confirmed" if banned else data["reputation"][username_lower]["confidence_level"]
+        # Bans are logged like reports and replayed in order on startup
+        ban_dict = {"kind": "ban", "username": username_lc, "banned": banned, "seq": STATE["seq"] + 1}
+        apply_ban(ban_dict)
+        written = append_report_log(encode_report(ban_dict))
+        invalidate_stats_cache()
+        bump_write_version()
+        writes_since_snapshot += 1
 
-        save_reports(data)
+        await written
 
         return {
             "success": True,
@@ -374,6 +856,8 @@ async def mark_player_banned(username: str, banned: bool = True):
             "is_banned": banned
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 